@@ -15,7 +15,15 @@ from harlequin_odbc.interactions import (
 )
 
 if TYPE_CHECKING:
-    from harlequin_odbc.adapter import HarlequinOdbcConnection
+    from harlequin_odbc.connection import HarlequinOdbcConnection
+
+
+def _qualify(identifier: str, source_identifier: str | None) -> str:
+    # with several data sources, identifiers are namespaced by source so
+    # that e.g. the "master" databases of two servers don't collide
+    if source_identifier is None:
+        return identifier
+    return f"{source_identifier}.{identifier}"
 
 
 @dataclass
@@ -60,6 +68,7 @@ class RelationCatalogItem(InteractiveCatalogItem["HarlequinOdbcConnection"]):
         db_label: str,
         rel_type: str,
         connection: "HarlequinOdbcConnection",
+        source_identifier: str | None = None,
     ) -> "RelationCatalogItem":
         rel_type_map: dict[str, type[RelationCatalogItem]] = {
             "TABLE": TableCatalogItem,
@@ -71,7 +80,9 @@ class RelationCatalogItem(InteractiveCatalogItem["HarlequinOdbcConnection"]):
 
         item_class = rel_type_map.get(rel_type, TableCatalogItem)
         return item_class(
-            qualified_identifier=f'"{db_label}"."{schema_label}"."{label}"',
+            qualified_identifier=_qualify(
+                f'"{db_label}"."{schema_label}"."{label}"', source_identifier
+            ),
             query_name=f'"{schema_label}"."{label}"',
             label=label,
             schema_label=schema_label,
@@ -137,12 +148,15 @@ class SchemaCatalogItem(InteractiveCatalogItem["HarlequinOdbcConnection"]):
         db_label: str,
         connection: "HarlequinOdbcConnection",
         children: list[CatalogItem] | None = None,
+        source_identifier: str | None = None,
     ) -> "SchemaCatalogItem":
         schema_identifier = f'"{label}"'
         if children is None:
             children = []
         return cls(
-            qualified_identifier=f'"{db_label}".{schema_identifier}',
+            qualified_identifier=_qualify(
+                f'"{db_label}".{schema_identifier}', source_identifier
+            ),
             query_name=schema_identifier,
             label=label,
             db_label=db_label,
@@ -165,12 +179,13 @@ class DatabaseCatalogItem(InteractiveCatalogItem["HarlequinOdbcConnection"]):
         label: str,
         connection: "HarlequinOdbcConnection",
         children: list[CatalogItem] | None = None,
+        source_identifier: str | None = None,
     ) -> "DatabaseCatalogItem":
         database_identifier = f'"{label}"'
         if children is None:
             children = []
         return cls(
-            qualified_identifier=database_identifier,
+            qualified_identifier=_qualify(database_identifier, source_identifier),
             query_name=database_identifier,
             label=label,
             type_label="db",
@@ -178,3 +193,26 @@ class DatabaseCatalogItem(InteractiveCatalogItem["HarlequinOdbcConnection"]):
             children=children,
             loaded=True,
         )
+
+
+class SourceCatalogItem(InteractiveCatalogItem["HarlequinOdbcConnection"]):
+    @classmethod
+    def from_label(
+        cls,
+        label: str,
+        source_identifier: str,
+        connection: "HarlequinOdbcConnection",
+        children: list[CatalogItem] | None = None,
+    ) -> "SourceCatalogItem":
+        if children is None:
+            children = []
+        return cls(
+            qualified_identifier=source_identifier,
+            # a data source has no name that could be used in a query
+            query_name="",
+            label=label,
+            type_label="src",
+            connection=connection,
+            children=children,
+            loaded=True,
+        )
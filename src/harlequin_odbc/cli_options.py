@@ -1,5 +1,44 @@
 from __future__ import annotations
 
 from harlequin import HarlequinAdapterOption
+from harlequin.options import SelectOption, TextOption
 
-ODBC_OPTIONS: list[HarlequinAdapterOption] = []
+
+def _int_validator(s: str | None) -> tuple[bool, str]:
+    if s is None:
+        return True, ""
+    try:
+        value = int(s)
+    except ValueError:
+        return False, f"Cannot convert {s} to an int!"
+    if value < 0:
+        return False, "Must not be negative."
+    return True, ""
+
+
+transaction_mode = SelectOption(
+    name="transaction-mode",
+    description=(
+        "The transaction mode to use for queries executed from the editor. "
+        "In autocommit mode, every statement is committed as soon as it is "
+        "executed. In manual mode, statements are grouped into a single "
+        "transaction that must be committed or rolled back explicitly. "
+        "The mode can also be switched while Harlequin is running."
+    ),
+    choices=["autocommit", "manual"],
+    default="autocommit",
+)
+
+max_result_memory = TextOption(
+    name="max-result-memory",
+    description=(
+        "The maximum amount of memory, in MB, that the rows of a single query "
+        "result may use. Once the estimated size of the fetched rows reaches "
+        "this budget, Harlequin stops fetching and keeps the rows it already "
+        "has, without notifying you. Disabled (0) by default."
+    ),
+    default="0",
+    validator=_int_validator,
+)
+
+ODBC_OPTIONS: list[HarlequinAdapterOption] = [transaction_mode, max_result_memory]
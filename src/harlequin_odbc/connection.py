@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any, Sequence
+
+import pyodbc
+from harlequin import HarlequinConnection, HarlequinCursor
+from harlequin.autocomplete.completion import HarlequinCompletion
+from harlequin.catalog import Catalog, CatalogItem
+from harlequin.exception import (
+    HarlequinConnectionError,
+    HarlequinQueryError,
+)
+from harlequin.transaction_mode import HarlequinTransactionMode
+from textual_fastdatatable.backend import AutoBackendType
+
+from harlequin_odbc.catalog import (
+    DatabaseCatalogItem,
+    RelationCatalogItem,
+    SchemaCatalogItem,
+    SourceCatalogItem,
+)
+
+logger = logging.getLogger(__name__)
+
+# rows are fetched in batches of at most this many rows when a memory
+# budget is set, so we can stop before the budget is exceeded
+FETCH_BATCH_SIZE = 1000
+# number of rows per batch whose actual size is measured
+ROW_SAMPLE_SIZE = 20
+# (N)VARCHAR(MAX) and VARBINARY(MAX) columns report a size of 0 or ~2**31
+UNBOUNDED_COLUMN_SIZE = 2**30
+FIXED_VALUE_SIZE = 64
+
+
+def _parse_conn_str(conn_str: str) -> dict[str, str]:
+    """
+    Parses an ODBC connection string into a dict of lowercased keys and values.
+    Values may be wrapped in braces to include semicolons; a "}}" inside braces
+    is an escaped "}".
+    """
+    params: dict[str, str] = {}
+    pos, n = 0, len(conn_str)
+    while pos < n:
+        eq = conn_str.find("=", pos)
+        if eq == -1:
+            break
+        key = conn_str[pos:eq].rpartition(";")[2].strip().lower()
+        pos = eq + 1
+        while pos < n and conn_str[pos].isspace():
+            pos += 1
+        if conn_str.startswith("{", pos):
+            chars: list[str] = []
+            pos += 1
+            while pos < n:
+                if conn_str[pos] == "}":
+                    if conn_str.startswith("}}", pos):
+                        chars.append("}")
+                        pos += 2
+                        continue
+                    pos += 1
+                    break
+                chars.append(conn_str[pos])
+                pos += 1
+            value = "".join(chars)
+            end = conn_str.find(";", pos)
+        else:
+            end = conn_str.find(";", pos)
+            value = conn_str[pos : end if end != -1 else n].strip()
+        if key:
+            params[key] = value
+        if end == -1:
+            break
+        pos = end + 1
+    return params
+
+
+def _source_label(conn_str: str) -> str:
+    """
+    Returns a short, human-readable name for the data source described by
+    an ODBC connection string (the DSN or server, plus the database, if given).
+    Never includes credentials.
+    """
+    params = _parse_conn_str(conn_str)
+    label = params.get("dsn") or params.get("server") or "ODBC"
+    if params.get("database"):
+        label = f"{label}/{params['database']}"
+    return label
+
+
+def _estimate_row_size(
+    description: Sequence[tuple[str, Any, int, int, int, int, bool]],
+) -> tuple[int, bool]:
+    """
+    Estimates the in-memory size of a single row, in bytes, from the display
+    and internal sizes in a cursor's description. Returns the estimate and
+    whether every column has a bounded size (if not, unbounded columns are
+    counted as empty).
+    """
+    size = sys.getsizeof(()) + 8 * len(description)
+    is_bounded = True
+    for _, col_type, display_size, internal_size, *_ in description:
+        if col_type in (str, bytes):
+            col_size = internal_size or display_size or 0
+            if col_size <= 0 or col_size >= UNBOUNDED_COLUMN_SIZE:
+                is_bounded = False
+                col_size = 0
+            size += sys.getsizeof(col_type()) + col_size
+        else:
+            size += FIXED_VALUE_SIZE
+    return size, is_bounded
+
+
+def _row_size(row: pyodbc.Row) -> int:
+    """
+    Returns the in-memory size, in bytes, of a single row and its values.
+    """
+    return sys.getsizeof(row) + sum(sys.getsizeof(val) for val in row)
+
+
+def _sample_row_size(rows: Sequence[pyodbc.Row]) -> int:
+    """
+    Returns the average in-memory size, in bytes, of up to ROW_SAMPLE_SIZE
+    rows spread evenly across rows.
+    """
+    sample = rows[:: max(1, len(rows) // ROW_SAMPLE_SIZE)]
+    total = sum(_row_size(row) for row in sample)
+    return max(1, -(-total // len(sample)))
+
+
+class HarlequinOdbcCursor(HarlequinCursor):
+    def __init__(self, cur: pyodbc.Cursor, max_result_bytes: int | None = None) -> None:
+        self.cur = cur
+        self._limit: int | None = None
+        self._max_result_bytes = max_result_bytes
+
+    def columns(self) -> list[tuple[str, str]]:
+        # todo: use getTypeInfo
+        type_mapping = {
+            "bool": "t/f",
+            "int": "##",
+            "float": "#.#",
+            "Decimal": "#.#",
+            "str": "s",
+            "bytes": "0b",
+            "date": "d",
+            "time": "t",
+            "datetime": "dt",
+            "UUID": "uid",
+        }
+        return [
+            (
+                col_name if col_name else "(No column name)",
+                type_mapping.get(col_type.__name__, "?"),
+            )
+            for col_name, col_type, *_ in self.cur.description
+        ]
+
+    def set_limit(self, limit: int) -> HarlequinOdbcCursor:
+        self._limit = limit
+        return self
+
+    def fetchall(self) -> AutoBackendType:
+        try:
+            if self._max_result_bytes is not None:
+                return self._fetch_within_budget(self._max_result_bytes)
+            elif self._limit is None:
+                return self.cur.fetchall()
+            else:
+                return self.cur.fetchmany(self._limit)
+        except Exception as e:
+            raise HarlequinQueryError(
+                msg=str(e),
+                title="Harlequin encountered an error while executing your query.",
+            ) from e
+
+    def _fetch_within_budget(self, max_bytes: int) -> list[pyodbc.Row]:
+        row_size, is_bounded = _estimate_row_size(self.cur.description)
+        if not is_bounded:
+            return self._fetch_rows_within_budget(max_bytes)
+        rows: list[pyodbc.Row] = []
+        used_bytes = 0
+        while self._limit is None or len(rows) < self._limit:
+            # row_size is estimated from the declared column sizes. It is not a
+            # strict upper bound (e.g., non-Latin-1 text takes more than one
+            # byte per character), so a batch can overshoot the remaining
+            # budget by up to FETCH_BATCH_SIZE rows
+            batch_size = min(
+                FETCH_BATCH_SIZE, max(1, (max_bytes - used_bytes) // row_size)
+            )
+            if self._limit is not None:
+                batch_size = min(batch_size, self._limit - len(rows))
+            batch = self.cur.fetchmany(batch_size)
+            if not batch:
+                break
+            # variable-length values are usually far smaller than their
+            # declared size, so account for the rows we actually got
+            sampled_size = _sample_row_size(batch)
+            n_fit = (max_bytes - used_bytes) // sampled_size
+            if n_fit < len(batch):
+                rows.extend(batch[:n_fit])
+                self._log_truncation(n_rows=len(rows), max_bytes=max_bytes)
+                break
+            rows.extend(batch)
+            used_bytes += sampled_size * len(batch)
+            if len(batch) < batch_size:
+                break
+        return rows
+
+    def _fetch_rows_within_budget(self, max_bytes: int) -> list[pyodbc.Row]:
+        # (MAX) values can be arbitrarily large, so we fetch and measure one
+        # row at a time, and never hold more than one row over the budget
+        rows: list[pyodbc.Row] = []
+        used_bytes = 0
+        while self._limit is None or len(rows) < self._limit:
+            row = self.cur.fetchone()
+            if row is None:
+                break
+            used_bytes += _row_size(row)
+            if used_bytes > max_bytes:
+                self._log_truncation(n_rows=len(rows), max_bytes=max_bytes)
+                break
+            rows.append(row)
+        return rows
+
+    def _log_truncation(self, n_rows: int, max_bytes: int) -> None:
+        logger.warning(
+            "Kept the first %s rows of this result, because more rows would "
+            "exceed the result memory budget of %s MB.",
+            f"{n_rows:,}",
+            f"{max_bytes // 2**20:,}",
+        )
+
+
+class HarlequinOdbcConnection(HarlequinConnection):
+    def __init__(
+        self,
+        conn_str: Sequence[str],
+        init_message: str = "",
+        transaction_mode: str = "autocommit",
+        max_result_memory: int | None = None,
+        is_editor_source: bool = True,
+        source_identifier: str | None = None,
+    ) -> None:
+        assert len(conn_str) >= 1
+        self.init_message = init_message
+        self.max_result_bytes = max_result_memory * 2**20 if max_result_memory else None
+        # queries from the editor always run against the first connection string;
+        # any others only contribute their own branch of the data catalog.
+        self.is_editor_source = is_editor_source
+        self.source_label = _source_label(conn_str[0])
+        if source_identifier is None and len(conn_str) > 1:
+            source_identifier = "__source_0__"
+        self.source_identifier = source_identifier
+        self._transaction_modes = [
+            HarlequinTransactionMode(label="Auto"),
+            HarlequinTransactionMode(
+                label="Manual", commit=self.commit, rollback=self.rollback
+            ),
+        ]
+        self._transaction_mode_index = 1 if transaction_mode == "manual" else 0
+        self._has_open_transaction = False
+        self._database_items: list[CatalogItem] = []
+        try:
+            self.conn = pyodbc.connect(
+                conn_str[0], autocommit=not self._in_manual_transaction_mode
+            )
+            # catalog-only sources never run editor queries, so their catalog
+            # and interactions can share a single connection
+            self.aux_conn = (
+                pyodbc.connect(conn_str[0], autocommit=True)
+                if is_editor_source
+                else self.conn
+            )
+        except Exception as e:
+            raise HarlequinConnectionError(
+                msg=str(e), title="Harlequin could not connect to your database."
+            ) from e
+        self.sources: list[HarlequinOdbcConnection] = [self]
+        try:
+            for i, other_conn_str in enumerate(conn_str[1:], start=1):
+                self.sources.append(
+                    HarlequinOdbcConnection(
+                        [other_conn_str],
+                        is_editor_source=False,
+                        source_identifier=f"__source_{i}__",
+                    )
+                )
+        except HarlequinConnectionError:
+            self.close()
+            raise
+
+    def execute(self, query: str) -> HarlequinOdbcCursor | None:
+        try:
+            cur = self.conn.cursor()
+            cur.execute(query)
+        except Exception as e:
+            msg = f"{e.__class__.__name__}: {e}"
+            if self._in_manual_transaction_mode:
+                # leave the data as it was before the failed script
+                with suppress(Exception):
+                    self.conn.rollback()
+                self._has_open_transaction = False
+                msg = f"{msg}\n\nThe open transaction has been rolled back."
+            raise HarlequinQueryError(
+                msg=msg,
+                title="Harlequin encountered an error while executing your query.",
+            ) from e
+        else:
+            if self._in_manual_transaction_mode:
+                self._has_open_transaction = True
+            if cur.description is not None:
+                return HarlequinOdbcCursor(cur, max_result_bytes=self.max_result_bytes)
+            else:
+                return None
+
+    def get_catalog(self) -> Catalog:
+        if len(self.sources) == 1:
+            return Catalog(items=self._get_database_items())
+        # each source lists its tables on its own aux connection, so the
+        # sources can be queried concurrently.
+        with ThreadPoolExecutor(max_workers=len(self.sources)) as executor:
+            source_items: list[CatalogItem] = list(
+                executor.map(lambda source: source._get_source_item(), self.sources)
+            )
+        return Catalog(items=source_items)
+
+    def _get_source_item(self) -> SourceCatalogItem:
+        label = self.source_label
+        try:
+            db_items = self._get_database_items()
+        except Exception as e:
+            # one unreachable source shouldn't blank the catalogs of the others
+            logger.warning("Could not load the catalog for %s: %s", label, e)
+            db_items = self._database_items
+            label = f"{label} (unavailable)"
+        return SourceCatalogItem.from_label(
+            label=label,
+            source_identifier=self.source_identifier or "",
+            connection=self,
+            children=db_items,
+        )
+
+    @property
+    def transaction_mode(self) -> HarlequinTransactionMode:
+        return self._transaction_modes[self._transaction_mode_index]
+
+    def toggle_transaction_mode(self) -> HarlequinTransactionMode:
+        # Harlequin calls this from the UI thread, so we must not raise. An
+        # open transaction has to be committed or rolled back explicitly
+        # before the mode can change.
+        if self._has_open_transaction:
+            return self.transaction_mode
+        new_index = (self._transaction_mode_index + 1) % len(self._transaction_modes)
+        try:
+            self.conn.autocommit = new_index == 0
+        except Exception as e:
+            logger.warning("Could not change the transaction mode: %s", e)
+            return self.transaction_mode
+        self._transaction_mode_index = new_index
+        return self.transaction_mode
+
+    def commit(self) -> None:
+        try:
+            self.conn.commit()
+            self._has_open_transaction = False
+        except Exception as e:
+            raise HarlequinQueryError(
+                msg=f"{e.__class__.__name__}: {e}",
+                title="Harlequin could not commit the transaction.",
+            ) from e
+
+    def rollback(self) -> None:
+        try:
+            self.conn.rollback()
+            self._has_open_transaction = False
+        except Exception as e:
+            raise HarlequinQueryError(
+                msg=f"{e.__class__.__name__}: {e}",
+                title="Harlequin could not roll back the transaction.",
+            ) from e
+
+    @property
+    def _in_manual_transaction_mode(self) -> bool:
+        return self._transaction_mode_index != 0
+
+    def close(self) -> None:
+        with suppress(Exception):
+            self.conn.close()
+        if self.aux_conn is not self.conn:
+            with suppress(Exception):
+                self.aux_conn.close()
+        for source in self.sources[1:]:
+            source.close()
+
+    def _get_database_items(self) -> list[CatalogItem]:
+        if self._has_open_transaction:
+            # the catalog is read on aux_conn, which would block on the schema
+            # locks held by the open transaction; Harlequin refreshes the
+            # catalog again after a commit or rollback
+            return self._database_items
+        raw_catalog = self._list_tables()
+        db_items: list[CatalogItem] = []
+        for db, schemas in raw_catalog.items():
+            schema_items: list[CatalogItem] = []
+            for schema, relations in schemas.items():
+                rel_items: list[CatalogItem] = []
+                for rel, rel_type in relations:
+                    rel_items.append(
+                        RelationCatalogItem.from_label(
+                            label=rel,
+                            schema_label=schema,
+                            db_label=db,
+                            rel_type=rel_type,
+                            source_identifier=self.source_identifier,
+                            connection=self,
+                        )
+                    )
+                schema_items.append(
+                    SchemaCatalogItem.from_label(
+                        label=schema,
+                        db_label=db,
+                        source_identifier=self.source_identifier,
+                        connection=self,
+                        children=rel_items,
+                    )
+                )
+            db_items.append(
+                DatabaseCatalogItem.from_label(
+                    label=db,
+                    source_identifier=self.source_identifier,
+                    connection=self,
+                    children=schema_items,
+                )
+            )
+        self._database_items = db_items
+        return db_items
+
+    def _list_tables(self) -> dict[str, dict[str, list[tuple[str, str]]]]:
+        cur = self.aux_conn.cursor()
+        catalog: dict[str, dict[str, list[tuple[str, str]]]] = {}
+        for db_name, schema_name, rel_name, rel_type, *_ in cur.tables(catalog="%"):
+            if db_name is None:
+                continue
+            if db_name not in catalog:
+                catalog[db_name] = dict()
+
+            if schema_name is None:
+                continue
+            if schema_name not in catalog[db_name]:
+                catalog[db_name][schema_name] = list()
+
+            if rel_name is not None:
+                catalog[db_name][schema_name].append((rel_name, rel_type or ""))
+
+        return catalog
+
+    def _list_columns_in_relation(
+        self, catalog_name: str, schema_name: str, rel_name: str
+    ) -> list[tuple[str, str]]:
+        cur = self.aux_conn.cursor()
+        raw_cols = cur.columns(table=rel_name, catalog=catalog_name, schema=schema_name)
+        return [(col[3], col[5]) for col in raw_cols]
+
+    def get_completions(self) -> list[HarlequinCompletion]:
+        return []
@@ -16,11 +16,25 @@ if TYPE_CHECKING:
     )
 
 
+def _check_editor_source(
+    item: "DatabaseCatalogItem" | "RelationCatalogItem",
+    driver: "HarlequinDriver",
+) -> bool:
+    if item.connection is None or item.connection.is_editor_source:
+        return True
+    driver.notify(
+        "Queries in the editor only run against the first data source, so this "
+        f"is not available for {item.connection.source_label}.",
+        severity="warning",
+    )
+    return False
+
+
 def execute_use_statement(
     item: "DatabaseCatalogItem",
     driver: "HarlequinDriver",
 ) -> None:
-    if item.connection is None:
+    if item.connection is None or not _check_editor_source(item, driver):
         return
     try:
         item.connection.execute(f"use {item.query_name}")
@@ -99,6 +113,8 @@ def show_select_star(
     item: "RelationCatalogItem",
     driver: "HarlequinDriver",
 ) -> None:
+    if not _check_editor_source(item, driver):
+        return
     driver.insert_text_in_new_buffer(
         dedent(
             f"""
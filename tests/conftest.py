@@ -5,10 +5,8 @@ from typing import Generator
 import pyodbc
 import pytest
 
-from harlequin_odbc.adapter import (
-    HarlequinOdbcAdapter,
-    HarlequinOdbcConnection,
-)
+from harlequin_odbc.adapter import HarlequinOdbcAdapter
+from harlequin_odbc.connection import HarlequinOdbcConnection
 
 MASTER_DB_CONN = "Driver={ODBC Driver 18 for SQL Server};Server=tcp:localhost,1433;Database=master;Uid=sa;Pwd={for-testing};Encrypt=yes;TrustServerCertificate=yes;Connection Timeout=5;"  # noqa: E501
 TEST_DB_CONN = "Driver={ODBC Driver 18 for SQL Server};Server=tcp:localhost,1433;Database=test;Uid=sa;Pwd={for-testing};Encrypt=yes;TrustServerCertificate=yes;Connection Timeout=5;"  # noqa: E501
@@ -5,13 +5,19 @@ from typing import Generator
 import pytest
 from harlequin.adapter import HarlequinAdapter, HarlequinConnection, HarlequinCursor
 from harlequin.catalog import Catalog, CatalogItem
-from harlequin.exception import HarlequinConnectionError, HarlequinQueryError
+from harlequin.exception import (
+    HarlequinConfigError,
+    HarlequinConnectionError,
+    HarlequinQueryError,
+)
 from textual_fastdatatable.backend import create_backend
 
-from harlequin_odbc.adapter import (
-    HarlequinOdbcAdapter,
+from harlequin_odbc.adapter import HarlequinOdbcAdapter
+from harlequin_odbc.catalog import DatabaseCatalogItem, SourceCatalogItem
+from harlequin_odbc.connection import (
     HarlequinOdbcConnection,
     HarlequinOdbcCursor,
+    _source_label,
 )
 
 CONN_STR = os.environ["ODBC_CONN_STR"]
@@ -35,6 +41,25 @@ def test_init_extra_kwargs() -> None:
     assert HarlequinOdbcAdapter(conn_str=(CONN_STR,), foo=1, bar="baz").connect()
 
 
+def test_connect_multiple_sources() -> None:
+    conn = HarlequinOdbcAdapter(conn_str=(CONN_STR, CONN_STR)).connect()
+    assert isinstance(conn, HarlequinConnection)
+    assert len(conn.sources) == 2
+    conn.close()
+
+
+def test_init_raises_config_error_for_bad_transaction_mode() -> None:
+    with pytest.raises(HarlequinConfigError):
+        _ = HarlequinOdbcAdapter(conn_str=(CONN_STR,), transaction_mode="foo")
+
+
+def test_init_raises_config_error_for_bad_max_result_memory() -> None:
+    with pytest.raises(HarlequinConfigError):
+        _ = HarlequinOdbcAdapter(conn_str=(CONN_STR,), max_result_memory="foo")
+    with pytest.raises(HarlequinConfigError):
+        _ = HarlequinOdbcAdapter(conn_str=(CONN_STR,), max_result_memory="-1")
+
+
 def test_connect_raises_connection_error() -> None:
     with pytest.raises(HarlequinConnectionError):
         _ = HarlequinOdbcAdapter(conn_str=("foo",)).connect()
@@ -57,6 +82,63 @@ def test_get_catalog(connection: HarlequinOdbcConnection) -> None:
     assert isinstance(catalog.items[0], CatalogItem)
 
 
+def test_get_catalog_multiple_sources() -> None:
+    conn = HarlequinOdbcAdapter(conn_str=(CONN_STR, CONN_STR)).connect()
+    catalog = conn.get_catalog()
+    assert len(catalog.items) == 2
+    assert all(isinstance(item, SourceCatalogItem) for item in catalog.items)
+    for source_item, source in zip(catalog.items, conn.sources, strict=True):
+        assert isinstance(source_item, SourceCatalogItem)
+        assert source_item.connection is source
+        assert source_item.children
+        assert all(
+            isinstance(item, DatabaseCatalogItem) for item in source_item.children
+        )
+    assert conn.sources[0].is_editor_source
+    assert not conn.sources[1].is_editor_source
+    # identical sources must not share qualified identifiers
+    first, second = catalog.items
+    assert first.qualified_identifier != second.qualified_identifier
+    first_ids = {item.qualified_identifier for item in first.children}
+    second_ids = {item.qualified_identifier for item in second.children}
+    assert first_ids.isdisjoint(second_ids)
+    assert {item.query_name for item in first.children} == {
+        item.query_name for item in second.children
+    }
+    conn.close()
+
+
+def test_get_catalog_multiple_sources_with_failed_source() -> None:
+    conn = HarlequinOdbcAdapter(conn_str=(CONN_STR, CONN_STR)).connect()
+    conn.sources[1].close()
+    catalog = conn.get_catalog()
+    assert len(catalog.items) == 2
+    first, second = catalog.items
+    assert first.children
+    assert not first.label.endswith("(unavailable)")
+    assert second.label.endswith("(unavailable)")
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "conn_str,expected",
+    [
+        ("DSN=snowflake;Uid=me;Pwd=secret", "snowflake"),
+        (
+            "Driver={ODBC Driver 18 for SQL Server};Server=tcp:localhost,1433;"
+            "Database=test;Uid=sa;Pwd={for-testing};",
+            "tcp:localhost,1433/test",
+        ),
+        ("Driver={Some Driver};Pwd=secret", "ODBC"),
+        ("Server=a;Database=b;Pwd={p;Server=evil}", "a/b"),
+        ("Pwd={p;Server=evil}};Database=evil};Server=a", "a"),
+        ("Server = {a;b} ;Database=c", "a;b/c"),
+    ],
+)
+def test_source_label(conn_str: str, expected: str) -> None:
+    assert _source_label(conn_str) == expected
+
+
 def test_execute_ddl(connection: HarlequinOdbcConnection) -> None:
     cur = connection.execute("create table test.foo (a int)")
     assert cur is None
@@ -93,6 +175,138 @@ def test_set_limit(connection: HarlequinOdbcConnection) -> None:
     assert backend.row_count == 2
 
 
+def test_max_result_memory() -> None:
+    conn = HarlequinOdbcAdapter(conn_str=(CONN_STR,), max_result_memory="1").connect()
+    cur = conn.execute(
+        "select top 10000 replicate(cast('x' as varchar(max)), 1000) as a "
+        "from sys.all_objects as l cross join sys.all_objects as r"
+    )
+    assert isinstance(cur, HarlequinOdbcCursor)
+    data = cur.fetchall()
+    backend = create_backend(data)
+    assert 0 < backend.row_count < 10000
+    conn.close()
+
+
+def test_max_result_memory_bounded_columns() -> None:
+    conn = HarlequinOdbcAdapter(conn_str=(CONN_STR,), max_result_memory="1").connect()
+    cur = conn.execute(
+        "select top 10000 cast(replicate('x', 1000) as varchar(1000)) as a "
+        "from sys.all_objects as l cross join sys.all_objects as r"
+    )
+    assert isinstance(cur, HarlequinOdbcCursor)
+    data = cur.fetchall()
+    backend = create_backend(data)
+    assert 0 < backend.row_count < 10000
+    conn.close()
+
+
+def test_max_result_memory_not_reached(caplog: pytest.LogCaptureFixture) -> None:
+    conn = HarlequinOdbcAdapter(conn_str=(CONN_STR,), max_result_memory="1").connect()
+    cur = conn.execute("select 1 as a union all select 2 union all select 3")
+    assert isinstance(cur, HarlequinOdbcCursor)
+    data = cur.fetchall()
+    backend = create_backend(data)
+    assert backend.row_count == 3
+    assert not caplog.records
+    conn.close()
+
+
+def test_max_result_memory_disabled_by_default(
+    connection: HarlequinOdbcConnection,
+) -> None:
+    assert connection.max_result_bytes is None
+
+
 def test_execute_raises_query_error(connection: HarlequinOdbcConnection) -> None:
     with pytest.raises(HarlequinQueryError):
         _ = connection.execute("selec;")
+
+
+def test_transaction_mode(connection: HarlequinOdbcConnection) -> None:
+    assert connection.transaction_mode.label == "Auto"
+    assert connection.transaction_mode.commit is None
+    new_mode = connection.toggle_transaction_mode()
+    assert new_mode.label == "Manual"
+    assert connection.transaction_mode == new_mode
+    assert connection.toggle_transaction_mode().label == "Auto"
+
+
+def test_manual_transaction_mode_option() -> None:
+    conn = HarlequinOdbcAdapter(
+        conn_str=(CONN_STR,), transaction_mode="manual"
+    ).connect()
+    assert conn.transaction_mode.label == "Manual"
+    assert conn.transaction_mode.commit is not None
+    assert conn.transaction_mode.rollback is not None
+    conn.close()
+
+
+@pytest.fixture
+def manual_connection(
+    connection: HarlequinOdbcConnection,
+) -> Generator[HarlequinOdbcConnection, None, None]:
+    connection.execute("create table test.tx (a int)")
+    connection.toggle_transaction_mode()
+    assert connection.transaction_mode.label == "Manual"
+    try:
+        yield connection
+    finally:
+        connection.rollback()
+        connection.toggle_transaction_mode()
+        connection.execute("drop table if exists test.tx")
+
+
+def test_manual_transaction_mode_rollback(
+    manual_connection: HarlequinOdbcConnection,
+) -> None:
+    conn = manual_connection
+    conn.execute("insert into test.tx values (1)")
+    conn.execute("insert into test.tx values (2)")
+    conn.rollback()
+    cur = conn.execute("select * from test.tx")
+    assert cur is not None
+    assert len(cur.fetchall() or []) == 0
+
+
+def test_manual_transaction_mode_rollback_on_error(
+    manual_connection: HarlequinOdbcConnection,
+) -> None:
+    conn = manual_connection
+    conn.execute("insert into test.tx values (1)")
+    with pytest.raises(HarlequinQueryError):
+        conn.execute("insert into test.tx values ('not an int')")
+    cur = conn.execute("select * from test.tx")
+    assert cur is not None
+    assert len(cur.fetchall() or []) == 0
+
+
+def test_toggle_with_open_transaction(
+    manual_connection: HarlequinOdbcConnection,
+) -> None:
+    conn = manual_connection
+    conn.execute("insert into test.tx values (1)")
+    assert conn.toggle_transaction_mode().label == "Manual"
+    conn.rollback()
+    cur = conn.execute("select * from test.tx")
+    assert cur is not None
+    assert len(cur.fetchall() or []) == 0
+    conn.rollback()
+    assert conn.toggle_transaction_mode().label == "Auto"
+    assert conn.toggle_transaction_mode().label == "Manual"
+
+
+def test_manual_transaction_mode_catalog(
+    manual_connection: HarlequinOdbcConnection,
+) -> None:
+    conn = manual_connection
+    before = conn.get_catalog()
+    conn.execute("create table test.tx_new (a int)")
+    # must not block on the open transaction's schema locks
+    during = conn.get_catalog()
+    assert [item.label for item in during.items] == [
+        item.label for item in before.items
+    ]
+    conn.rollback()
+    after = conn.get_catalog()
+    assert after.items
@@ -3,7 +3,6 @@ from typing import Generator
 import pytest
 from harlequin.catalog import InteractiveCatalogItem
 
-from harlequin_odbc.adapter import HarlequinOdbcConnection
 from harlequin_odbc.catalog import (
     ColumnCatalogItem,
     DatabaseCatalogItem,
@@ -12,6 +11,7 @@ from harlequin_odbc.catalog import (
     TableCatalogItem,
     ViewCatalogItem,
 )
+from harlequin_odbc.connection import HarlequinOdbcConnection
 
 
 @pytest.fixture
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+# harlequin imports every installed adapter at startup, so importing
+# harlequin_odbc (on top of harlequin itself) must stay cheap.
+IMPORT_TIME_BUDGET_US = 5_000
+
+LAZY_MODULES = [
+    "pyodbc",
+    "harlequin_odbc.catalog",
+    "harlequin_odbc.connection",
+    "harlequin_odbc.interactions",
+]
+
+
+def test_import_does_not_load_driver() -> None:
+    code = (
+        "import sys\n"
+        "from importlib.metadata import entry_points\n"
+        "entry_points(group='harlequin.adapter')['odbc'].load()\n"
+        f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_import_time() -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import harlequin, harlequin_odbc"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines look like: "import time:  self [us] | cumulative | imported package"
+    cumulative_us = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+        and line.split("|")[2].strip() == "harlequin_odbc"
+    ]
+    assert len(cumulative_us) == 1
+    assert cumulative_us[0] < IMPORT_TIME_BUDGET_US
+
+
+def test_legacy_import_path() -> None:
+    from harlequin_odbc import connection
+    from harlequin_odbc.adapter import HarlequinOdbcConnection, HarlequinOdbcCursor
+
+    assert HarlequinOdbcConnection is connection.HarlequinOdbcConnection
+    assert HarlequinOdbcCursor is connection.HarlequinOdbcCursor